@@ -6,9 +6,15 @@
 # the Apache License 2.0.  The full license can be found in the LICENSE file.
 #
 from hashlib import md5
-import json
+import logging
 from tornado import web
 
+try:
+    # orjson is optional, but much faster at serializing the resource payloads
+    from orjson import dumps as _dumps
+except ImportError:
+    from json import dumps as _dumps
+
 from notebook.base.handlers import APIHandler
 from notebook.services.contents.manager import ContentsManager
 
@@ -30,7 +36,10 @@ class MetaManager(ContentsManager):
 
         self.resources = []
         self._default_root_manager = self._jupyterfsConfig.root_manager_class(**self._kwargs)
-        self._managers = dict((('', self._default_root_manager),))
+        self._managers = {'': self._default_root_manager}
+
+        # cache of resource url -> drive hash, so that unchanged resources are not rehashed
+        self._url_hashes = {}
 
         # copy kwargs to pyfs_kw, removing kwargs not relevant to pyfs
         self._pyfs_kw.update(kwargs)
@@ -46,25 +55,40 @@ class MetaManager(ContentsManager):
         cache = 'cache' not in options or options['cache']
         verbose = 'verbose' in options and options['verbose']
 
-        self.resources = []
-        managers = dict((('', self._default_root_manager),))
+        # build the new resources and managers locally, so that nothing changes if a resource fails to init
+        newResources = []
+        newManagers = {}
+        newUrlHashes = {}
+        seen = set()
+        needed = {''}
 
         for resource in resources:
+            # get deterministic hash of PyFilesystem url. This is a
+            # non-cryptographic dedup key for the drive prefix, not a security
+            # token. Drives are part of frontend widget ids and document paths,
+            # so changing the hash would break saved workspaces
+            url = resource['url']
+            _hash = self._url_hashes.get(url)
+            if _hash is None:
+                _hash = md5(url.encode('utf-8')).hexdigest()[:8]
+            newUrlHashes[url] = _hash
+
+            if _hash in seen:
+                # skip redundant resources entirely
+                self.log.debug('jupyter-fs skipping resource %r, which has the same url as an earlier resource', resource.get('name'))
+                continue
+            seen.add(_hash)
+
             # server side resources don't have a default 'auth' key
             if 'auth' not in resource:
                 resource['auth'] = 'ask'
 
-            # get deterministic hash of PyFilesystem url
-            _hash = md5(resource['url'].encode('utf-8')).hexdigest()[:8]
             init = False
             missingTokens = None
 
             if _hash in self._managers and cache:
                 # reuse existing cm
-                managers[_hash] = self._managers[_hash]
-                init = True
-            elif _hash in managers and cache:
-                # don't add redundant cm
+                needed.add(_hash)
                 init = True
             else:
                 if resource['auth'] == 'ask':
@@ -81,11 +105,12 @@ class MetaManager(ContentsManager):
                 else:
                     # create new cm
                     default_writable = resource.get('defaultWritable', True)
-                    managers[_hash] = FSManager(
+                    newManagers[_hash] = FSManager(
                         urlSubbed,
                         default_writable=default_writable,
                         **self._pyfs_kw
                     )
+                    needed.add(_hash)
                     init = True
 
             # assemble resource from spec + hash
@@ -102,13 +127,23 @@ class MetaManager(ContentsManager):
                 # sanity check: tokenDict should not make the round trip
                 raise ValueError('tokenDict not removed from resource by initResource')
 
-            self.resources.append(newResource)
+            newResources.append(newResource)
+
+        # drop any contents managers that are no longer in use, then add the new ones
+        for _hash in set(self._managers) - needed:
+            del self._managers[_hash]
+        self._managers.update(newManagers)
+        self.resources = newResources
 
-        # replace existing contents managers with new
-        self._managers = managers
+        # only keep the hashes of urls in this call, evicting the rest
+        self._url_hashes = newUrlHashes
 
-        if verbose:
-            print('jupyter-fs initialized: {} file system resources, {} managers'.format(len(self.resources), len(self._managers)))
+        self.log.log(
+            logging.INFO if verbose else logging.DEBUG,
+            'jupyter-fs initialized: %d file system resources, %d managers',
+            len(self.resources),
+            len(self._managers),
+        )
 
         return self.resources
 
@@ -148,14 +183,14 @@ class MetaManager(ContentsManager):
     )
 
 class MetaManagerHandler(APIHandler):
-    _jupyterfsConfig = None
-
     @property
     def config_resources(self):
-        if self._jupyterfsConfig is None:
-            self._jupyterfsConfig = JupyterfsConfig(config=self.config)
+        # server config is fixed for the life of the app, so only read it once
+        resources = self.settings.get('jupyterfs_config_resources')
+        if resources is None:
+            resources = self.settings['jupyterfs_config_resources'] = JupyterfsConfig(config=self.config).resources
 
-        return self._jupyterfsConfig.resources
+        return resources
 
     @web.authenticated
     async def get(self):
@@ -174,7 +209,7 @@ class MetaManagerHandler(APIHandler):
         which will allow the frontent to instantiate 3 new filetrees, one
         for each of the available contents managers.
         """
-        self.finish(json.dumps(self.contents_manager.resources))
+        self.finish(_dumps(self.contents_manager.resources))
 
     @web.authenticated
     async def post(self):
@@ -187,6 +222,6 @@ class MetaManagerHandler(APIHandler):
         else:
             resources = body['resources']
 
-        self.finish(json.dumps(
+        self.finish(_dumps(
             self.contents_manager.initResource(*resources, options=options)
         ))
@@ -28,8 +28,8 @@ def _resolve_path(path, manager_dict):
     Returns:
         tuple: prefix of contents manager, instance of contents manager, relative path to request from contents manager
     """
-    parts = path.strip('/').split(":")
-    if len(parts) == 1:
+    prefix, sep, mgr_path = path.strip('/').partition(':')
+    if not sep:
         # Try to find use the root manager, if one was supplied.
         mgr = manager_dict.get('')
         if mgr is not None:
@@ -42,9 +42,9 @@ def _resolve_path(path, manager_dict):
         )
     else:
         # Try to find a sub-manager for the first subdirectory.
-        mgr = manager_dict.get(parts[0])
+        mgr = manager_dict.get(prefix)
         if mgr is not None:
-            return parts[0], mgr, '/'.join(parts[1:])
+            return prefix, mgr, mgr_path.replace(':', '/')
 
         raise HTTPError(
             404,
@@ -5,10 +5,7 @@
 # This file is part of the jupyter-fs library, distributed under the terms of
 # the Apache License 2.0.  The full license can be found in the LICENSE file.
 
-from pathlib import Path
 import pytest
-import os
-import shutil
 import socket
 import sys
 
@@ -19,17 +16,13 @@ test_dir = 'test'
 test_content = 'foo\nbar\nbaz'
 test_fname = 'foo.txt'
 
-test_root_osfs = 'osfs_local'
-
 test_url_s3 = 'http://127.0.0.1/'
 test_port_s3 = '9000'
 
-test_host_smb_docker_share = socket.gethostbyname(socket.gethostname())
 test_hostname_smb_docker_share = 'TESTNET'
 test_name_port_smb_docker_share = 3669
 
 test_direct_tcp_smb_os_share = False
-test_host_smb_os_share = socket.gethostbyname_ex(socket.gethostname())[2][-1]
 test_smb_port_smb_os_share = 139
 
 _test_file_model = {
@@ -43,6 +36,14 @@ _test_file_model = {
 }
 
 
+# resolve the smb hosts lazily, so that collecting this module doesn't block on dns
+def _test_host_smb_docker_share():
+    return socket.gethostbyname(socket.gethostname())
+
+def _test_host_smb_os_share():
+    return socket.gethostbyname_ex(socket.gethostname())[2][-1]
+
+
 class _TestBase:
     """Contains tests universal to all PyFilesystemContentsManager flavors
     """
@@ -50,9 +51,11 @@ class _TestBase:
     def _createContentsManager(self):
         raise NotImplementedError
 
-    def testWriteRead(self):
-        cm = self._createContentsManager()
+    @pytest.fixture
+    def cm(self):
+        return self._createContentsManager()
 
+    def testWriteRead(self, cm):
         fpaths = [
             '' + test_fname,
             'root0/' + test_fname,
@@ -76,20 +79,12 @@ class _TestBase:
 
 
 class Test_FSManager_osfs(_TestBase):
-    """No extra setup required for this test suite
+    """Each test runs against its own pytest tmp_path
     """
-    _test_dir = str(Path(test_root_osfs) / Path(test_dir))
-
-    @classmethod
-    def setup_class(cls):
-        shutil.rmtree(test_root_osfs, ignore_errors=True)
-        os.makedirs(test_root_osfs)
-
-    def setup_method(self, method):
-        os.makedirs(self._test_dir)
-
-    def teardown_method(self, method):
-        shutil.rmtree(self._test_dir, ignore_errors=True)
+    @pytest.fixture(autouse=True)
+    def _setup_test_dir(self, tmp_path):
+        # pytest creates (and eventually cleans up) a fresh dir for each test
+        self._test_dir = str(tmp_path)
 
     def _createContentsManager(self):
         uri = 'osfs://{local_dir}'.format(local_dir=self._test_dir)
@@ -111,20 +106,21 @@ class Test_FSManager_s3(_TestBase):
             # start up the server
             cls._rootDirUtil.start()
 
-        # delete any existing root
+        # replace any existing root with a fresh one, shared by all tests in the class
         cls._rootDirUtil.delete()
+        cls._rootDirUtil.create()
 
     @classmethod
     def teardown_class(cls):
+        cls._rootDirUtil.delete()
+
         if sys.platform != 'win32':
             # stop the server
             cls._rootDirUtil.stop()
 
-    def setup_method(self, method):
-        self._rootDirUtil.create()
-
     def teardown_method(self, method):
-        self._rootDirUtil.delete()
+        # empty the root, without the cost of recreating it for every test
+        self._rootDirUtil.clear()
 
     def _createContentsManager(self):
         uri = 's3://{id}:{key}@{bucket}?endpoint_url={url}:{port}'.format(
@@ -152,39 +148,36 @@ class Test_FSManager_smb_docker_share(_TestBase):
 
         docker run --rm -it -p 137:137/udp -p 138:138/udp -p 139:139 -p 445:445 mcr.microsoft.com/windows/nanoserver:1809
     """
-    _rootDirUtil = samba.RootDirUtil(
-        dir_name=test_dir,
-        host=test_host_smb_docker_share,
-        hostname=test_hostname_smb_docker_share,
-        name_port=test_name_port_smb_docker_share,
-    )
-
     @classmethod
     def setup_class(cls):
+        cls._rootDirUtil = samba.RootDirUtil(
+            dir_name=test_dir,
+            host=_test_host_smb_docker_share(),
+            hostname=test_hostname_smb_docker_share,
+            name_port=test_name_port_smb_docker_share,
+        )
+
         # start up the server
         cls._rootDirUtil.start()
 
-        # delete any existing root
+        # delete any existing root, then create a root shared by all tests in the class
         cls._rootDirUtil.delete()
+        cls._rootDirUtil.create()
 
     @classmethod
     def teardown_class(cls):
         # stop the server
         cls._rootDirUtil.stop()
 
-    def setup_method(self, method):
-        # create a root
-        self._rootDirUtil.create()
-
     def teardown_method(self, method):
-        # delete any existing root
+        # empty the root. The share itself is defined by smb.conf, so it stays in place for the next test
         self._rootDirUtil.delete()
 
     def _createContentsManager(self):
         uri = 'smb://{username}:{passwd}@{host}/{share}?name-port={name_port}'.format(
             username=samba.smb_user,
             passwd=samba.smb_passwd,
-            host=test_host_smb_docker_share,
+            host=self._rootDirUtil.host,
             name_port=test_name_port_smb_docker_share,
             share=test_dir,
         )
@@ -199,14 +192,14 @@ class Test_FSManager_smb_os_share(_TestBase):
     """(windows only. future: also mac) Uses the os's buitlin samba server.
     Expects a local user "smbuser" with access to a share named "test"
     """
-    _rootDirUtil = samba.RootDirUtil(
-        dir_name=test_dir,
-        host=test_host_smb_os_share,
-        smb_port=test_smb_port_smb_os_share
-    )
-
     @classmethod
     def setup_class(cls):
+        cls._rootDirUtil = samba.RootDirUtil(
+            dir_name=test_dir,
+            host=_test_host_smb_os_share(),
+            smb_port=test_smb_port_smb_os_share
+        )
+
         # delete any existing root
         cls._rootDirUtil.delete()
 
@@ -221,7 +214,7 @@ class Test_FSManager_smb_os_share(_TestBase):
     def _createContentsManager(self):
         kwargs = dict(
             direct_tcp=test_direct_tcp_smb_os_share,
-            host=test_host_smb_os_share,
+            host=self._rootDirUtil.host,
             hostname=socket.getfqdn(),
             passwd=samba.smb_passwd,
             share=test_dir,
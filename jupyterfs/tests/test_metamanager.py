@@ -0,0 +1,154 @@
+# *****************************************************************************
+#
+# Copyright (c) 2019, the jupyter-fs authors.
+#
+# This file is part of the jupyter-fs library, distributed under the terms of
+# the Apache License 2.0.  The full license can be found in the LICENSE file.
+
+import asyncio
+from fs.errors import CreateFailed
+from hashlib import md5
+import json
+from mock import MagicMock, patch
+import pytest
+import tornado.web
+from traitlets.config import Config
+
+from jupyterfs.fsmanager import FSManager
+from jupyterfs.metamanager import MetaManager, MetaManagerHandler
+
+
+def _osfs_resource(name, path):
+    return {'name': name, 'url': 'osfs://{}'.format(path)}
+
+
+class TestMetaManager:
+    def test_init_resource_opens_fs(self, tmp_path):
+        mm = MetaManager()
+
+        resources = mm.initResource(_osfs_resource('a', tmp_path))
+
+        assert [r['init'] for r in resources] == [True]
+        assert isinstance(mm._managers[resources[0]['drive']], FSManager)
+
+    def test_init_resource_bad_url_raises(self, tmp_path):
+        mm = MetaManager()
+        bad = _osfs_resource('a', tmp_path / 'nonexistent')
+
+        with pytest.raises(CreateFailed):
+            mm.initResource(bad)
+        assert list(mm._managers) == ['']
+
+        # once fixed, the same resource can still be initialized
+        (tmp_path / 'nonexistent').mkdir()
+        resources = mm.initResource(bad)
+        assert [r['init'] for r in resources] == [True]
+        assert resources[0]['drive'] in mm._managers
+
+    def test_init_resource_drive_is_stable(self):
+        # drives end up in frontend widget ids and saved document paths, so
+        # changing how they are derived from the url must be a deliberate choice
+        mm = MetaManager()
+
+        resources = mm.initResource({'name': 'mem', 'url': 'mem://'})
+
+        assert [r['drive'] for r in resources] == ['d209383a']
+
+    def test_init_resource_skips_duplicate_url(self, tmp_path):
+        mm = MetaManager()
+
+        resources = mm.initResource(_osfs_resource('a', tmp_path), _osfs_resource('a2', tmp_path))
+
+        assert [r['name'] for r in resources] == ['a']
+        assert sorted(mm._managers) == sorted(['', resources[0]['drive']])
+
+    def test_init_resource_reuses_and_evicts_managers(self, tmp_path):
+        mm = MetaManager()
+        (tmp_path / 'a').mkdir()
+        (tmp_path / 'b').mkdir()
+
+        a, b = mm.initResource(_osfs_resource('a', tmp_path / 'a'), _osfs_resource('b', tmp_path / 'b'))
+        a_manager = mm._managers[a['drive']]
+
+        resources = mm.initResource(_osfs_resource('a', tmp_path / 'a'))
+
+        assert [r['drive'] for r in resources] == [a['drive']]
+        assert mm._managers[a['drive']] is a_manager
+        assert b['drive'] not in mm._managers
+
+    def test_init_resource_url_hash_cache(self, tmp_path):
+        mm = MetaManager()
+        (tmp_path / 'a').mkdir()
+        (tmp_path / 'b').mkdir()
+        a = _osfs_resource('a', tmp_path / 'a')
+        b = _osfs_resource('b', tmp_path / 'b')
+
+        with patch('jupyterfs.metamanager.md5', wraps=md5) as md5_spy:
+            drives = [r['drive'] for r in mm.initResource(a, b)]
+            assert md5_spy.call_count == 2
+
+            # a's hash is reused from the cache, and b's is evicted
+            assert [r['drive'] for r in mm.initResource(a)] == drives[:1]
+            assert md5_spy.call_count == 2
+
+            # so b has to be hashed again, to the same drive
+            assert [r['drive'] for r in mm.initResource(a, b)] == drives
+            assert md5_spy.call_count == 3
+
+    def test_init_resource_failure_keeps_managers(self, tmp_path):
+        mm = MetaManager()
+        (tmp_path / 'a').mkdir()
+        (tmp_path / 'c').mkdir()
+
+        resources = mm.initResource(_osfs_resource('a', tmp_path / 'a'))
+        managers = dict(mm._managers)
+
+        # 'c' is fine, but 'b' fails after it, so neither should be applied
+        with pytest.raises(CreateFailed):
+            mm.initResource(_osfs_resource('c', tmp_path / 'c'), _osfs_resource('b', tmp_path / 'b'))
+
+        assert mm._managers == managers
+        assert mm.resources == resources
+
+
+@pytest.fixture(params=['orjson', 'json'])
+def dumps(request):
+    return pytest.importorskip(request.param).dumps
+
+
+class TestMetaManagerHandler:
+    def _createHandler(self, tmp_path, contents_manager):
+        app = tornado.web.Application(
+            config=Config({'Jupyterfs': {'resources': [_osfs_resource('server', tmp_path)]}}),
+            contents_manager=contents_manager,
+        )
+        h = MetaManagerHandler(app, MagicMock())
+        h.current_user = 'user'
+        h.finish = MagicMock()
+        return h
+
+    def _body(self, h):
+        (body,), _ = h.finish.call_args
+        return json.loads(body)
+
+    def test_get(self, tmp_path, dumps):
+        mm = MetaManager()
+        resources = mm.initResource(_osfs_resource('a', tmp_path))
+        h = self._createHandler(tmp_path, mm)
+
+        with patch('jupyterfs.metamanager._dumps', dumps):
+            asyncio.run(h.get())
+
+        assert self._body(h) == resources
+
+    def test_post(self, tmp_path, dumps):
+        mm = MetaManager()
+        h = self._createHandler(tmp_path, mm)
+        body = {'options': {'_addServerside': True}, 'resources': [_osfs_resource('client', tmp_path / 'client')]}
+        (tmp_path / 'client').mkdir()
+
+        with patch('jupyterfs.metamanager._dumps', dumps), patch.object(h, 'get_json_body', return_value=body):
+            asyncio.run(h.post())
+
+        assert [r['name'] for r in self._body(h)] == ['server', 'client']
+        assert self._body(h) == mm.resources
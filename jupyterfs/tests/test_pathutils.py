@@ -0,0 +1,28 @@
+# *****************************************************************************
+#
+# Copyright (c) 2019, the jupyter-fs authors.
+#
+# This file is part of the jupyter-fs library, distributed under the terms of
+# the Apache License 2.0.  The full license can be found in the LICENSE file.
+
+import pytest
+from tornado.web import HTTPError
+
+from jupyterfs.pathutils import _resolve_path
+
+
+class TestResolvePath:
+    managers = {'': 'root', 'abcd1234': 'drive'}
+
+    @pytest.mark.parametrize('path, expected', [
+        ('foo/bar', ('', 'root', 'foo/bar')),
+        ('/abcd1234:foo/bar/', ('abcd1234', 'drive', 'foo/bar')),
+        ('abcd1234:foo:bar', ('abcd1234', 'drive', 'foo/bar')),
+        ('abcd1234:', ('abcd1234', 'drive', '')),
+    ])
+    def test_resolve_path(self, path, expected):
+        assert _resolve_path(path, self.managers) == expected
+
+    def test_resolve_path_unknown_drive(self):
+        with pytest.raises(HTTPError):
+            _resolve_path('missing:foo', self.managers)
@@ -94,17 +94,28 @@ class RootDirUtil:
             # create the bucket
             self.resource().create_bucket(Bucket=self.dir_name)
 
-    def delete(self):
+    def clear(self):
+        """delete all of the keys in the bucket, but leave the bucket itself
+        """
         if self.exists():
             bucket = self.resource().Bucket(self.dir_name)
 
-            # walk the bucket from leaves to roots and delete as you go.
-            # This avoids deleting non-empty s3 folders (extremely slow)
-            for key in reversed(list(bucket.objects.all())):
-                key.delete()
+            # delete every key, in batches of up to 1000 (the most delete_objects
+            # accepts). Order within a batch isn't guaranteed, so don't rely on it
+            keys = [{'Key': obj.key} for obj in bucket.objects.all()]
+            for i in range(0, len(keys), 1000):
+                resp = bucket.delete_objects(Delete={'Objects': keys[i:i + 1000]})
+
+                # failed deletes are reported in the response, rather than raised
+                if resp.get('Errors'):
+                    raise RuntimeError('failed to clear s3 bucket {}: {}'.format(self.dir_name, resp['Errors']))
+
+    def delete(self):
+        if self.exists():
+            self.clear()
 
             # delete the bucket
-            bucket.delete()
+            self.resource().Bucket(self.dir_name).delete()
 
     def resource(self):
         boto_kw = dict(
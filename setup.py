@@ -59,7 +59,12 @@ requires = [
     'notebook>=5.7.0',
 ]
 
-test_requires = [
+# optional, used to speed up serializing the jupyter-fs resources api responses
+orjson_requires = [
+    'orjson',
+]
+
+test_requires = orjson_requires + [
     'boto3',
     'docker',
     'fs-miniofs',
@@ -101,7 +106,8 @@ setup(
     packages=find_packages(exclude=('js', 'js.*')),
     install_requires=requires,
     extras_require={
-        'dev': dev_requires
+        'dev': dev_requires,
+        'orjson': orjson_requires,
     },
     include_package_data=True,
     zip_safe=False,